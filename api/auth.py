@@ -5,7 +5,11 @@ Uses FastAPI dependencies to secure endpoints.
 """
 
 import os
-from typing import Optional, Dict, Any
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import create_client, Client
@@ -20,9 +24,101 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY") 
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
+# Opt-in cache of verified token claims (set SUPABASE_JWT_CACHE=enabled)
+SUPABASE_JWT_CACHE = os.getenv("SUPABASE_JWT_CACHE", "disabled").lower() == "enabled"
+
 # Security scheme for FastAPI
 security = HTTPBearer()
 
+def _extract_user_info(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the user info dict from already-verified token claims.
+    
+    Args:
+        claims: Decoded JWT payload
+        
+    Returns:
+        Dict containing user information
+        
+    Raises:
+        HTTPException: If the claims carry no user ID
+    """
+    user_metadata = claims.get("user_metadata", {})
+    user_info = {
+        "user_id": claims.get("sub"),
+        "email": claims.get("email"),
+        "role": claims.get("role", "authenticated"),
+        "aud": claims.get("aud"),
+        "exp": claims.get("exp"),
+        "iat": claims.get("iat"),
+        "display_name": user_metadata.get("display_name")
+    }
+    
+    if not user_info["user_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token: missing user ID",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user_info
+
+class TokenVerificationCache:
+    """
+    Bounded LRU cache of verified JWT claims with a short TTL.
+    
+    Entries are keyed by the SHA-256 digest of the token, so raw tokens
+    are never stored. An entry lives for at most `ttl` seconds and never
+    past the token's own `exp` claim.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached claims for a token, or None on a miss"""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(claims)
+    
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache the claims of a successfully verified token"""
+        now = time.time()
+        ttl = self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(exp - now, ttl)
+        if ttl <= 0:
+            return
+        
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (now + ttl, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
 class SupabaseAuth:
     """Handles Supabase authentication operations"""
     
@@ -32,11 +128,18 @@ class SupabaseAuth:
         
         self.client: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
         self.jwt_secret = SUPABASE_JWT_SECRET
+        self.token_cache: Optional[TokenVerificationCache] = (
+            TokenVerificationCache() if SUPABASE_JWT_CACHE else None
+        )
     
     def verify_jwt_token(self, token: str) -> Dict[str, Any]:
         """
         Verify and decode a Supabase JWT token.
         
+        When the verification cache is enabled, a token verified within
+        the last few seconds is served from the cache without decoding.
+        Tokens that fail verification are never cached.
+        
         Args:
             token: The JWT token to verify
             
@@ -46,6 +149,11 @@ class SupabaseAuth:
         Raises:
             HTTPException: If token is invalid or expired
         """
+        if self.token_cache is not None:
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                return cached
+        
         try:
             # If we have the JWT secret, verify the signature
             if self.jwt_secret:
@@ -63,6 +171,9 @@ class SupabaseAuth:
                     options={"verify_signature": False}
                 )
             
+            if self.token_cache is not None:
+                self.token_cache.set(token, payload)
+            
             return payload
             
         except ExpiredSignatureError:
@@ -89,27 +200,7 @@ class SupabaseAuth:
             Dict containing user information
         """
         payload = self.verify_jwt_token(token)
-        
-        # Extract user info from token payload
-        user_metadata = payload.get("user_metadata", {})
-        user_info = {
-            "user_id": payload.get("sub"),
-            "email": payload.get("email"),
-            "role": payload.get("role", "authenticated"),
-            "aud": payload.get("aud"),
-            "exp": payload.get("exp"),
-            "iat": payload.get("iat"),
-            "display_name": user_metadata.get("display_name")
-        }
-        
-        if not user_info["user_id"]:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing user ID",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user_info
+        return _extract_user_info(payload)
 
 # Global auth instance
 supabase_auth = SupabaseAuth()
@@ -11,10 +11,15 @@ from sqlalchemy import TypeDecorator, CHAR
 from sqlalchemy.dialects import postgresql
 import enum
 import uuid
+from datetime import datetime, timezone
 
 class Base(DeclarativeBase):
     pass
 
+def utcnow() -> datetime:
+    """Timezone-aware current time, used as the client-side default for timestamps"""
+    return datetime.now(timezone.utc)
+
 # UUID type that works with both PostgreSQL and SQLite
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
@@ -71,8 +76,8 @@ class Profile(Base):
     user_id = Column(GUID(), primary_key=True)  # Removed default since this comes from Supabase
     display_name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False, unique=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     created_bands = relationship("Band", back_populates="creator")
@@ -89,7 +94,7 @@ class Band(Base):
     timezone = Column(String(50), nullable=False, default="America/New_York")
     join_code = Column(String(20), nullable=False, unique=True)
     created_by = Column(GUID(), ForeignKey("profiles.user_id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
     
     # Relationships
     creator = relationship("Profile", back_populates="created_bands")
@@ -105,7 +110,7 @@ class Membership(Base):
     band_id = Column(GUID(), ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(GUID(), ForeignKey("profiles.user_id", ondelete="CASCADE"), nullable=False)
     role = Column(SQLEnum(BandRole), nullable=False, default=BandRole.MEMBER)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
     
     # Relationships
     band = relationship("Band", back_populates="memberships")
@@ -144,7 +149,7 @@ class Event(Base):
     venue_id = Column(GUID(), ForeignKey("venues.id", ondelete="SET NULL"), nullable=True)
     notes = Column(Text, nullable=True)
     created_by = Column(GUID(), ForeignKey("profiles.user_id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now())
     
     # Relationships
     band = relationship("Band", back_populates="events")
@@ -6,10 +6,11 @@ This layer abstracts database operations and provides a clean interface for the
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy import and_, or_, insert
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 import secrets
+from contextlib import asynccontextmanager
 
 from models import Profile, Band, Membership, Venue, Event, BandRole, EventStatus
 from schemas import (
@@ -21,20 +22,68 @@ class BandRepository:
     
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Set while inside bulk_setup(); individual operations then flush instead of committing
+        self._defer_commit = False
+
+    async def _commit(self) -> None:
+        """Commit, or only flush while a bulk_setup() block is open"""
+        if self._defer_commit:
+            await self.db.flush()
+        else:
+            await self.db.commit()
+
+    @asynccontextmanager
+    async def bulk_setup(self) -> AsyncIterator["BandRepository"]:
+        """Run several operations in one transaction, committed once when the block exits"""
+        if self._defer_commit:
+            # Nested blocks join the outer transaction
+            yield self
+            return
+        
+        self._defer_commit = True
+        try:
+            yield self
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        finally:
+            self._defer_commit = False
 
     # Profile operations
     async def create_profile(self, profile_data: ProfileCreate, user_id: UUID) -> Profile:
         """Create a new user profile linked to Supabase auth user"""
-        db_profile = Profile(
-            user_id=user_id,
-            display_name=profile_data.display_name,
-            email=profile_data.email
+        # INSERT ... RETURNING hydrates the ORM object in the same statement
+        result = await self.db.execute(
+            insert(Profile)
+            .values(
+                user_id=user_id,
+                display_name=profile_data.display_name,
+                email=profile_data.email
+            )
+            .returning(Profile)
         )
-        self.db.add(db_profile)
-        await self.db.commit()
-        await self.db.refresh(db_profile)
+        db_profile = result.scalar_one()
+        await self._commit()
         return db_profile
 
+    async def bulk_create_profiles(self, profiles: List[Tuple[ProfileCreate, UUID]]) -> None:
+        """Create several profiles with a single multi-row INSERT"""
+        if not profiles:
+            return
+        
+        await self.db.execute(
+            insert(Profile).values([
+                {
+                    "user_id": user_id,
+                    "display_name": profile_data.display_name,
+                    "email": profile_data.email
+                }
+                for profile_data, user_id in profiles
+            ])
+        )
+        await self._commit()
+
     async def get_profile(self, user_id: UUID) -> Optional[Profile]:
         """Get user profile by ID"""
         result = await self.db.execute(
@@ -59,7 +108,7 @@ class BandRepository:
             if hasattr(profile, field) and value is not None:
                 setattr(profile, field, value)
         
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(profile)
         return profile
 
@@ -90,36 +139,51 @@ class BandRepository:
             if hasattr(profile, key):
                 setattr(profile, key, value)
         
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(profile)
         return profile
 
     # Band operations
-    async def create_band(self, band_data: BandCreate, created_by: UUID) -> Band:
-        """Create a new band and add creator as leader"""
+    async def create_band(self, band_data: BandCreate, created_by: UUID, with_members: bool = False) -> Band:
+        """Create a new band and add creator as leader.
+        
+        With with_members, the returned band has memberships (and their
+        profiles) eagerly loaded.
+        """
         # Generate unique join code
         join_code = secrets.token_urlsafe(8)
         
-        # Create band
-        db_band = Band(
-            name=band_data.name,
-            timezone=band_data.timezone,
-            join_code=join_code,
-            created_by=created_by
+        # Create band; RETURNING gives back the band with its generated ID
+        result = await self.db.execute(
+            insert(Band)
+            .values(
+                name=band_data.name,
+                timezone=band_data.timezone,
+                join_code=join_code,
+                created_by=created_by
+            )
+            .returning(Band)
         )
-        self.db.add(db_band)
-        await self.db.flush()  # Flush to get the band ID
+        db_band = result.scalar_one()
         
         # Add creator as leader
-        membership = Membership(
-            band_id=db_band.id,
-            user_id=created_by,
-            role=BandRole.LEADER
+        await self.db.execute(
+            insert(Membership).values(
+                band_id=db_band.id,
+                user_id=created_by,
+                role=BandRole.LEADER
+            )
         )
-        self.db.add(membership)
         
-        await self.db.commit()
-        await self.db.refresh(db_band)
+        await self._commit()
+        if with_members:
+            result = await self.db.execute(
+                select(Band)
+                .options(selectinload(Band.memberships).selectinload(Membership.user))
+                .where(Band.id == db_band.id)
+                .execution_options(populate_existing=True)
+            )
+            return result.scalar_one()
         return db_band
 
     async def get_band(self, band_id: UUID) -> Optional[Band]:
@@ -146,6 +210,18 @@ class BandRepository:
         )
         return result.scalars().all()
 
+    async def get_bands_with_members(self, band_ids: List[UUID]) -> Dict[UUID, Band]:
+        """Get several bands, with their memberships loaded, keyed by band ID"""
+        if not band_ids:
+            return {}
+        
+        result = await self.db.execute(
+            select(Band)
+            .options(selectinload(Band.memberships))
+            .where(Band.id.in_(band_ids))
+        )
+        return {band.id: band for band in result.scalars()}
+
     async def is_band_member(self, band_id: UUID, user_id: UUID) -> bool:
         """Check if user is a member of the band"""
         result = await self.db.execute(
@@ -175,13 +251,17 @@ class BandRepository:
             if hasattr(band, key):
                 setattr(band, key, value)
         
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(band)
         return band
 
     # Membership operations
-    async def join_band(self, join_code: str, user_id: UUID) -> Optional[Membership]:
-        """Join a band using join code"""
+    async def join_band(self, join_code: str, user_id: UUID, with_members: bool = False) -> Optional[Membership]:
+        """Join a band using join code.
+        
+        With with_members, membership.band.memberships (and their profiles)
+        are eagerly loaded on the returned membership.
+        """
         band = await self.get_band_by_join_code(join_code)
         if not band:
             return None
@@ -201,7 +281,19 @@ class BandRepository:
             role=BandRole.MEMBER
         )
         self.db.add(membership)
-        await self.db.commit()
+        await self._commit()
+        if with_members:
+            result = await self.db.execute(
+                select(Membership)
+                .options(
+                    selectinload(Membership.band)
+                    .selectinload(Band.memberships)
+                    .selectinload(Membership.user)
+                )
+                .where(Membership.id == membership.id)
+                .execution_options(populate_existing=True)
+            )
+            return result.scalar_one()
         await self.db.refresh(membership)
         return membership
 
@@ -225,7 +317,7 @@ class BandRepository:
             return None
         
         membership.role = role
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(membership)
         return membership
 
@@ -241,21 +333,24 @@ class BandRepository:
             return False
         
         await self.db.delete(membership)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Venue operations
     async def create_venue(self, venue_data: VenueCreate, band_id: UUID) -> Venue:
         """Create a new venue"""
-        db_venue = Venue(
-            band_id=band_id,
-            name=venue_data.name,
-            address=venue_data.address,
-            notes=venue_data.notes
+        result = await self.db.execute(
+            insert(Venue)
+            .values(
+                band_id=band_id,
+                name=venue_data.name,
+                address=venue_data.address,
+                notes=venue_data.notes
+            )
+            .returning(Venue)
         )
-        self.db.add(db_venue)
-        await self.db.commit()
-        await self.db.refresh(db_venue)
+        db_venue = result.scalar_one()
+        await self._commit()
         return db_venue
 
     async def get_venue(self, venue_id: UUID) -> Optional[Venue]:
@@ -284,7 +379,7 @@ class BandRepository:
             if hasattr(venue, key):
                 setattr(venue, key, value)
         
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(venue)
         return venue
 
@@ -295,25 +390,28 @@ class BandRepository:
             return False
         
         await self.db.delete(venue)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Event operations
     async def create_event(self, event_data: EventCreate, band_id: UUID, created_by: UUID) -> Event:
         """Create a new event"""
-        db_event = Event(
-            band_id=band_id,
-            type=event_data.type,
-            title=event_data.title,
-            starts_at_utc=event_data.starts_at_utc,
-            ends_at_utc=event_data.ends_at_utc,
-            venue_id=event_data.venue_id,
-            notes=event_data.notes,
-            created_by=created_by
+        result = await self.db.execute(
+            insert(Event)
+            .values(
+                band_id=band_id,
+                type=event_data.type,
+                title=event_data.title,
+                starts_at_utc=event_data.starts_at_utc,
+                ends_at_utc=event_data.ends_at_utc,
+                venue_id=event_data.venue_id,
+                notes=event_data.notes,
+                created_by=created_by
+            )
+            .returning(Event)
         )
-        self.db.add(db_event)
-        await self.db.commit()
-        await self.db.refresh(db_event)
+        db_event = result.scalar_one()
+        await self._commit()
         return db_event
 
     async def get_event(self, event_id: UUID) -> Optional[Event]:
@@ -346,7 +444,7 @@ class BandRepository:
             if hasattr(event, key):
                 setattr(event, key, value)
         
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(event)
         return event
 
@@ -357,7 +455,7 @@ class BandRepository:
             return False
         
         await self.db.delete(event)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Utility methods
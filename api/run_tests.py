@@ -57,7 +57,7 @@ def main():
     parser = argparse.ArgumentParser(description="Run Band Manager API tests")
     parser.add_argument(
         "--type", 
-        choices=["all", "unit", "integration", "api", "repository"],
+        choices=["all", "unit", "integration", "api", "repository", "smoke"],
         default="all",
         help="Type of tests to run"
     )
@@ -74,7 +74,21 @@ def main():
     parser.add_argument(
         "--fast",
         action="store_true",
-        help="Skip slow tests"
+        help="Skip slow and integration tests (contract tests are always skipped)"
+    )
+    parser.add_argument(
+        "--last-failed", "--lf",
+        action="store_true",
+        help="Re-run only the tests that failed last time"
+    )
+    parser.add_argument(
+        "--plain-asserts",
+        action="store_true",
+        help="Skip pytest's assertion rewriting (faster collection, terser failures)"
+    )
+    parser.add_argument(
+        "--workers", "-n",
+        help="Run tests in parallel with pytest-xdist (a worker count or 'auto')"
     )
     parser.add_argument(
         "--file",
@@ -106,9 +120,21 @@ def main():
             "--cov-fail-under=70"
         ])
     
+    # Add parallel execution
+    if args.workers:
+        cmd.extend(["-n", args.workers, "--dist=loadgroup"])
+    
+    # Trade rich assertion diffs for faster collection in CI
+    if args.plain_asserts:
+        cmd.append("--assert=plain")
+    
+    # Rerun only last failures (falls back to everything when none failed)
+    if args.last_failed:
+        cmd.append("--lf")
+    
     # Add test filtering
     if args.fast:
-        cmd.extend(["-m", "not slow"])
+        cmd.extend(["-m", "not slow and not integration and not contract"])
     
     # Add specific file or test
     if args.file:
@@ -120,6 +146,8 @@ def main():
             cmd.extend(["-m", "unit"])
         elif args.type == "integration":
             cmd.extend(["-m", "integration"])
+        elif args.type == "smoke":
+            cmd.extend(["-m", "smoke"])
         elif args.type == "api":
             cmd.append("tests/test_api.py")
         elif args.type == "repository":
@@ -6,14 +6,30 @@ and make it easy to create objects with specific attributes.
 """
 
 import factory
+from factory.alchemy import SQLAlchemyModelFactory
 from datetime import datetime, timezone, timedelta
+import secrets
 import uuid
 
 # Since we're using Pydantic schemas, we'll create factory classes for them
 from schemas import ProfileCreate, BandCreate, VenueCreate, EventCreate
-from models import EventType, BandRole, EventStatus, Membership
+from models import EventType, BandRole, EventStatus, Membership, Profile, Band, Venue, Event
 
-class ProfileFactory(factory.Factory):
+class SchemaFactory(factory.Factory):
+    """Base factory for Pydantic request schemas"""
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def build_fast(cls, **kwargs):
+        """Build the schema with model_construct, skipping Pydantic validation.
+        
+        Only for tests that need a known-good payload, not ones exercising validation.
+        """
+        return cls._meta.model.model_construct(**vars(cls.stub(**kwargs)))
+
+class ProfileFactory(SchemaFactory):
     """Factory for creating Profile test data"""
     
     class Meta:
@@ -22,7 +38,7 @@ class ProfileFactory(factory.Factory):
     display_name = factory.Sequence(lambda n: f"Test User {n}")
     email = factory.LazyAttribute(lambda obj: f"{obj.display_name.lower().replace(' ', '.')}@example.com")
 
-class BandFactory(factory.Factory):
+class BandFactory(SchemaFactory):
     """Factory for creating Band test data"""
     
     class Meta:
@@ -31,7 +47,7 @@ class BandFactory(factory.Factory):
     name = factory.Sequence(lambda n: f"Test Band {n}")
     timezone = "America/New_York"
 
-class VenueFactory(factory.Factory):
+class VenueFactory(SchemaFactory):
     """Factory for creating Venue test data"""
     
     class Meta:
@@ -41,7 +57,7 @@ class VenueFactory(factory.Factory):
     address = factory.Faker("address")
     notes = factory.Faker("text", max_nb_chars=200)
 
-class EventFactory(factory.Factory):
+class EventFactory(SchemaFactory):
     """Factory for creating Event test data"""
     
     class Meta:
@@ -75,6 +91,93 @@ class MembershipFactory(factory.Factory):
     
     role = BandRole.MEMBER
 
+# ORM factories for inserting rows directly, bypassing the HTTP layer
+class ModelFactory(SQLAlchemyModelFactory):
+    """Base for factories that add model rows straight to a database session.
+    
+    Rows are only added to the session; callers flush it themselves since
+    the test session is async. Bind a session with bind_model_factories().
+    """
+    
+    class Meta:
+        abstract = True
+        sqlalchemy_session_persistence = None
+
+class ProfileModelFactory(ModelFactory):
+    """Factory for Profile rows"""
+    
+    class Meta:
+        model = Profile
+    
+    user_id = factory.LazyFunction(uuid.uuid4)
+    display_name = factory.Sequence(lambda n: f"Test User {n}")
+    email = factory.LazyAttribute(lambda obj: f"{obj.display_name.lower().replace(' ', '.')}@example.com")
+
+class MembershipModelFactory(ModelFactory):
+    """Factory for Membership rows"""
+    
+    class Meta:
+        model = Membership
+    
+    role = BandRole.MEMBER
+
+class BandModelFactory(ModelFactory):
+    """Factory for Band rows, with the creator added as leader"""
+    
+    class Meta:
+        model = Band
+    
+    id = factory.LazyFunction(uuid.uuid4)
+    name = factory.Sequence(lambda n: f"Test Band {n}")
+    timezone = "America/New_York"
+    join_code = factory.LazyFunction(lambda: secrets.token_urlsafe(8))
+    leader = factory.RelatedFactory(
+        MembershipModelFactory,
+        factory_related_name="band",
+        user_id=factory.SelfAttribute("..created_by"),
+        role=BandRole.LEADER
+    )
+
+class VenueModelFactory(ModelFactory):
+    """Factory for Venue rows"""
+    
+    class Meta:
+        model = Venue
+    
+    id = factory.LazyFunction(uuid.uuid4)
+    name = factory.Sequence(lambda n: f"Test Venue {n}")
+    address = "123 Test Street"
+
+class EventModelFactory(ModelFactory):
+    """Factory for Event rows"""
+    
+    class Meta:
+        model = Event
+    
+    id = factory.LazyFunction(uuid.uuid4)
+    title = factory.Sequence(lambda n: f"Test Event {n}")
+    type = EventType.REHEARSAL
+    status = EventStatus.PLANNED
+    starts_at_utc = factory.LazyFunction(
+        lambda: datetime.now(timezone.utc) + timedelta(days=1)
+    )
+    ends_at_utc = factory.LazyAttribute(
+        lambda obj: obj.starts_at_utc + timedelta(hours=2)
+    )
+
+MODEL_FACTORIES = (
+    ProfileModelFactory,
+    MembershipModelFactory,
+    BandModelFactory,
+    VenueModelFactory,
+    EventModelFactory,
+)
+
+def bind_model_factories(session) -> None:
+    """Point every ORM factory at the given session (or None to unbind)"""
+    for model_factory in MODEL_FACTORIES:
+        model_factory._meta.sqlalchemy_session = session
+
 # Utility functions for creating test UUIDs
 def generate_test_uuid(seed: str = None) -> uuid.UUID:
     """Generate a deterministic UUID for testing"""
@@ -90,4 +193,5 @@ TEST_USER_ID_1 = uuid.UUID("11111111-1111-1111-1111-111111111111")
 TEST_USER_ID_2 = uuid.UUID("22222222-2222-2222-2222-222222222222")
 TEST_BAND_ID = uuid.UUID("33333333-3333-3333-3333-333333333333")
 TEST_VENUE_ID = uuid.UUID("44444444-4444-4444-4444-444444444444")
-TEST_EVENT_ID = uuid.UUID("55555555-5555-5555-5555-555555555555")
\ No newline at end of file
+TEST_EVENT_ID = uuid.UUID("55555555-5555-5555-5555-555555555555")
+TEST_SEEDED_USER_ID = uuid.UUID("66666666-6666-6666-6666-666666666666")
\ No newline at end of file
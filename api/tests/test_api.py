@@ -1,289 +1,194 @@
+import json
 import pytest
-from fastapi.testclient import TestClient
-from datetime import datetime, timezone
+from unittest.mock import ANY
+from uuid import UUID
+
+from main import root, health_check
+from models import Event
+
+# Fixed ID for requests that must be rejected before any lookup happens
+FAKE_ID = "12345678-1234-5678-1234-567812345678"
+
+# Request bodies shared across the module, JSON-encoded once at import
+JSON_HEADERS = {"content-type": "application/json"}
+
+PROFILE_PAYLOAD = {"display_name": "Test User", "email": "test@example.com"}
+PROFILE_PAYLOAD_BYTES = json.dumps(PROFILE_PAYLOAD).encode()
+PROFILE_EXPECTED = {**PROFILE_PAYLOAD, "user_id": ANY, "created_at": ANY, "updated_at": ANY}
+
+BAND_PAYLOAD = {"name": "Test Band", "timezone": "America/New_York"}
+BAND_PAYLOAD_BYTES = json.dumps(BAND_PAYLOAD).encode()
+
+VENUE_PAYLOAD = {"name": "Test Venue", "address": "123 Test Street", "notes": "Test venue notes"}
+VENUE_PAYLOAD_BYTES = json.dumps(VENUE_PAYLOAD).encode()
+
+REHEARSAL_EVENT = {
+    "title": "Test Rehearsal",
+    "type": "rehearsal",
+    "starts_at_utc": "2025-10-15T19:00:00Z",
+    "ends_at_utc": "2025-10-15T21:00:00Z",
+    "notes": "Test rehearsal notes"
+}
+REHEARSAL_EVENT_BYTES = json.dumps(REHEARSAL_EVENT).encode()
 
 
 class TestProfileEndpoints:
     """Test profile-related API endpoints with authentication"""
     
-    def test_create_profile_authenticated(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_create_profile_authenticated(self, authenticated_client_user_1):
         """Test POST /profiles endpoint with authentication"""
-        profile_data = {
-            "display_name": "Test User",
-            "email": mock_user_1["email"]  # Must match authenticated user
-        }
-        
-        response = authenticated_client_user_1.post(
-            "/profiles",
-            json=profile_data
+        # PROFILE_PAYLOAD uses user 1's email, as the endpoint requires
+        response = await authenticated_client_user_1.post(
+            "/profiles", content=PROFILE_PAYLOAD_BYTES, headers=JSON_HEADERS
         )
         
         assert response.status_code == 201
-        data = response.json()
-        assert data["display_name"] == profile_data["display_name"]
-        assert data["email"] == profile_data["email"]
-        assert "user_id" in data
-        assert "created_at" in data
+        assert response.json() == PROFILE_EXPECTED
     
-    def test_create_profile_unauthenticated(self, unauthenticated_client):
-        """Test POST /profiles endpoint without authentication"""
-        profile_data = {
-            "display_name": "Test User",
-            "email": "test@example.com"
-        }
-        
-        response = unauthenticated_client.post("/profiles", json=profile_data)
-        assert response.status_code == 403
-    
-    def test_create_profile_email_mismatch(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_create_profile_email_mismatch(self, authenticated_client_user_1):
         """Test creating profile with email not matching authenticated user"""
         profile_data = {
             "display_name": "Test User",
             "email": "different@example.com"
         }
         
-        response = authenticated_client_user_1.post("/profiles", json=profile_data)
+        response = await authenticated_client_user_1.post("/profiles", json=profile_data)
         assert response.status_code == 400
-        assert "must match authenticated user's email" in response.json()["detail"]
+        assert "must match authenticated user's email" in response.text
     
-    def test_get_profile(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_get_profile(self, authenticated_client_user_1, mock_user_1):
         """Test GET /profiles/{user_id} endpoint"""
         # First create a profile
         profile_data = {
             "display_name": "Test User",
             "email": mock_user_1["email"]
         }
-        create_response = authenticated_client_user_1.post("/profiles", json=profile_data)
+        create_response = await authenticated_client_user_1.post("/profiles", json=profile_data)
         assert create_response.status_code == 201
         profile = create_response.json()
         user_id = profile["user_id"]
         
         # Test getting the profile (authenticated user can get any profile)
-        response = authenticated_client_user_1.get(f"/profiles/{user_id}")
+        response = await authenticated_client_user_1.get(f"/profiles/{user_id}")
         assert response.status_code == 200
         
         data = response.json()
         assert data["user_id"] == user_id
         assert data["display_name"] == profile_data["display_name"]
-    
-    def test_get_profile_unauthenticated(self, unauthenticated_client):
-        """Test GET /profiles/{user_id} without authentication"""
-        fake_user_id = "12345678-1234-5678-1234-567812345678"
-        response = unauthenticated_client.get(f"/profiles/{fake_user_id}")
-        assert response.status_code == 403
 
 
 class TestBandEndpoints:
     """Test band-related API endpoints with authentication"""
     
-    def test_create_band_authenticated(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_create_band_authenticated(self, authenticated_client_user_1):
         """Test POST /bands endpoint with authentication"""
-        band_data = {
-            "name": "Test Band",
-            "timezone": "America/New_York"
-        }
-        
-        response = authenticated_client_user_1.post("/bands", json=band_data)
+        response = await authenticated_client_user_1.post(
+            "/bands", content=BAND_PAYLOAD_BYTES, headers=JSON_HEADERS
+        )
         
         assert response.status_code == 201
         data = response.json()
-        assert data["name"] == band_data["name"]
-        assert data["timezone"] == band_data["timezone"]
+        assert data["name"] == BAND_PAYLOAD["name"]
+        assert data["timezone"] == BAND_PAYLOAD["timezone"]
         assert "id" in data
         assert "join_code" in data
         assert "created_by" in data
     
-    def test_create_band_unauthenticated(self, unauthenticated_client):
-        """Test POST /bands endpoint without authentication"""
-        band_data = {
-            "name": "Test Band",
-            "timezone": "America/New_York"
-        }
-        
-        response = unauthenticated_client.post("/bands", json=band_data)
-        assert response.status_code == 403
-    
-    def test_get_band_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_band_as_member(self, authenticated_client_user_1, shared_band):
         """Test GET /bands/{band_id} as a band member"""
-        # Create a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        create_response = authenticated_client_user_1.post("/bands", json=band_data)
-        assert create_response.status_code == 201
-        band = create_response.json()
+        band = shared_band
         
         # Get the band (creator should be able to access)
-        response = authenticated_client_user_1.get(f"/bands/{band['id']}")
+        response = await authenticated_client_user_1.get(f"/bands/{band['id']}")
         assert response.status_code == 200
         
         data = response.json()
         assert data["id"] == band["id"]
         assert data["name"] == band["name"]
     
-    def test_get_band_as_non_member(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test GET /bands/{band_id} as a non-member"""
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        create_response = authenticated_client_user_1.post("/bands", json=band_data)
-        assert create_response.status_code == 201
-        band = create_response.json()
-        
-        # User 2 tries to access the band (should be forbidden)
-        response = authenticated_client_user_2.get(f"/bands/{band['id']}")
-        assert response.status_code == 403
-    
-    def test_get_band_unauthenticated(self, unauthenticated_client):
-        """Test GET /bands/{band_id} without authentication"""
-        fake_band_id = "12345678-1234-5678-1234-567812345678"
-        response = unauthenticated_client.get(f"/bands/{fake_band_id}")
-        assert response.status_code == 403
-    
-    def test_get_my_bands(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_my_bands(self, authenticated_client_user_1, band_factory):
         """Test GET /my/bands endpoint"""
         # Create a couple of bands
-        band_data_1 = {"name": "Band 1", "timezone": "America/New_York"}
-        band_data_2 = {"name": "Band 2", "timezone": "America/Los_Angeles"}
-        
-        response1 = authenticated_client_user_1.post("/bands", json=band_data_1)
-        response2 = authenticated_client_user_1.post("/bands", json=band_data_2)
-        assert response1.status_code == 201
-        assert response2.status_code == 201
+        band_1 = await band_factory()
+        band_2 = await band_factory(name="Band 2", timezone="America/Los_Angeles")
         
         # Get user's bands
-        response = authenticated_client_user_1.get("/my/bands")
+        response = await authenticated_client_user_1.get("/my/bands")
         assert response.status_code == 200
         
         bands = response.json()
         assert len(bands) == 2
         band_names = [band["name"] for band in bands]
-        assert "Band 1" in band_names
-        assert "Band 2" in band_names
+        assert band_1["name"] in band_names
+        assert band_2["name"] in band_names
     
-    def test_get_my_bands_unauthenticated(self, unauthenticated_client):
-        """Test GET /my/bands without authentication"""
-        response = unauthenticated_client.get("/my/bands")
-        assert response.status_code == 403
-    
-    def test_join_band_with_valid_code(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test POST /bands/join/{join_code} with valid join code"""
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        create_response = authenticated_client_user_1.post("/bands", json=band_data)
-        assert create_response.status_code == 201
-        band = create_response.json()
-        join_code = band["join_code"]
+    @pytest.mark.asyncio
+    async def test_band_lifecycle_member_sees_members(self, authenticated_client_user_1, authenticated_client_user_2, shared_band):
+        """Test joining with a valid code, then GET /bands/{band_id}/members as a member"""
+        band = shared_band
         
         # User 2 joins the band
-        response = authenticated_client_user_2.post(f"/bands/join/{join_code}")
-        assert response.status_code == 201
+        response = await authenticated_client_user_2.post(f"/bands/join/{band['join_code']}")
+        assert response.status_code == 200
         
         membership = response.json()
         assert membership["band_id"] == band["id"]
-        assert membership["role"] == "MEMBER"
-    
-    def test_join_band_unauthenticated(self, unauthenticated_client):
-        """Test POST /bands/join/{join_code} without authentication"""
-        response = unauthenticated_client.post("/bands/join/fake-code")
-        assert response.status_code == 403
-    
-    def test_get_band_members_as_member(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test GET /bands/{band_id}/members as a band member"""
-        # User 1 creates band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        create_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = create_response.json()
-        
-        # User 2 joins the band
-        join_response = authenticated_client_user_2.post(f"/bands/join/{band['join_code']}")
-        assert join_response.status_code == 201
+        assert membership["role"] == "member"
         
         # User 1 gets members list
-        response = authenticated_client_user_1.get(f"/bands/{band['id']}/members")
+        response = await authenticated_client_user_1.get(f"/bands/{band['id']}/members")
         assert response.status_code == 200
         
         members = response.json()
         assert len(members) == 2  # Creator + joiner
-    
-    def test_get_band_members_as_non_member(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test GET /bands/{band_id}/members as a non-member"""
-        # User 1 creates band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        create_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = create_response.json()
-        
-        # User 2 tries to get members (should be forbidden)
-        response = authenticated_client_user_2.get(f"/bands/{band['id']}/members")
-        assert response.status_code == 403
 
 
 class TestVenueEndpoints:
     """Test venue-related API endpoints with authentication"""
     
-    def test_create_venue_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_create_venue_as_member(self, authenticated_client_user_1, shared_band):
         """Test POST /bands/{band_id}/venues as a band member"""
-        # Create a band first
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
+        band = shared_band
         
         # Create a venue
-        venue_data = {
-            "name": "Test Venue",
-            "address": "123 Test Street",
-            "notes": "Test venue notes"
-        }
-        
-        response = authenticated_client_user_1.post(f"/bands/{band['id']}/venues", json=venue_data)
+        response = await authenticated_client_user_1.post(
+            f"/bands/{band['id']}/venues", content=VENUE_PAYLOAD_BYTES, headers=JSON_HEADERS
+        )
         
         assert response.status_code == 201
         data = response.json()
-        assert data["name"] == venue_data["name"]
-        assert data["address"] == venue_data["address"]
+        assert data["name"] == VENUE_PAYLOAD["name"]
+        assert data["address"] == VENUE_PAYLOAD["address"]
         assert data["band_id"] == band["id"]
     
-    def test_create_venue_as_non_member(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test POST /bands/{band_id}/venues as a non-member"""
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        # User 2 tries to create a venue (should be forbidden)
-        venue_data = {"name": "Test Venue", "address": "123 Test Street"}
-        response = authenticated_client_user_2.post(f"/bands/{band['id']}/venues", json=venue_data)
-        assert response.status_code == 403
-    
-    def test_get_band_venues_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_band_venues_as_member(self, authenticated_client_user_1, shared_band, venue_factory):
         """Test GET /bands/{band_id}/venues as a band member"""
-        # Create band and venue
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        venue_data = {"name": "Test Venue", "address": "123 Test Street"}
-        venue_response = authenticated_client_user_1.post(f"/bands/{band['id']}/venues", json=venue_data)
-        assert venue_response.status_code == 201
+        band = shared_band
+        venue = await venue_factory(band)
         
         # Get venues
-        response = authenticated_client_user_1.get(f"/bands/{band['id']}/venues")
+        response = await authenticated_client_user_1.get(f"/bands/{band['id']}/venues")
         assert response.status_code == 200
         
         venues = response.json()
         assert len(venues) == 1
-        assert venues[0]["name"] == venue_data["name"]
+        assert venues[0]["name"] == venue["name"]
     
-    def test_get_venue_by_id_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_venue_by_id_as_member(self, authenticated_client_user_1, shared_band, venue_factory):
         """Test GET /venues/{venue_id} as a band member"""
-        # Create band and venue
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        venue_data = {"name": "Test Venue", "address": "123 Test Street"}
-        venue_response = authenticated_client_user_1.post(f"/bands/{band['id']}/venues", json=venue_data)
-        venue = venue_response.json()
+        venue = await venue_factory(shared_band)
         
         # Get venue by ID
-        response = authenticated_client_user_1.get(f"/venues/{venue['id']}")
+        response = await authenticated_client_user_1.get(f"/venues/{venue['id']}")
         assert response.status_code == 200
         
         data = response.json()
@@ -294,159 +199,158 @@ class TestVenueEndpoints:
 class TestEventEndpoints:
     """Test event-related API endpoints with authentication"""
     
-    def test_create_event_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_create_event_as_member(self, authenticated_client_user_1, shared_band):
         """Test POST /bands/{band_id}/events as a band member"""
-        # Create a band first
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
+        band = shared_band
         
         # Create an event
-        event_data = {
-            "title": "Test Rehearsal",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z",
-            "notes": "Test rehearsal notes"
-        }
-        
-        response = authenticated_client_user_1.post(f"/bands/{band['id']}/events", json=event_data)
+        response = await authenticated_client_user_1.post(
+            f"/bands/{band['id']}/events", content=REHEARSAL_EVENT_BYTES, headers=JSON_HEADERS
+        )
         
         assert response.status_code == 201
         data = response.json()
-        assert data["title"] == event_data["title"]
-        assert data["type"] == event_data["type"]
+        assert data["title"] == REHEARSAL_EVENT["title"]
+        assert data["type"] == REHEARSAL_EVENT["type"]
         assert data["band_id"] == band["id"]
     
-    def test_create_event_as_non_member(self, authenticated_client_user_1, authenticated_client_user_2):
-        """Test POST /bands/{band_id}/events as a non-member"""
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        # User 2 tries to create an event (should be forbidden)
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        response = authenticated_client_user_2.post(f"/bands/{band['id']}/events", json=event_data)
-        assert response.status_code == 403
-    
-    def test_get_band_events_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_band_events_as_member(self, authenticated_client_user_1, shared_band, event_factory):
         """Test GET /bands/{band_id}/events as a band member"""
-        # Create band and event
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        event_response = authenticated_client_user_1.post(f"/bands/{band['id']}/events", json=event_data)
-        assert event_response.status_code == 201
+        band = shared_band
+        event = await event_factory(band)
         
         # Get events
-        response = authenticated_client_user_1.get(f"/bands/{band['id']}/events")
+        response = await authenticated_client_user_1.get(f"/bands/{band['id']}/events")
         assert response.status_code == 200
         
         events = response.json()
         assert len(events) == 1
-        assert events[0]["title"] == event_data["title"]
+        assert events[0]["title"] == event["title"]
     
-    def test_get_event_by_id_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_get_event_by_id_as_member(self, authenticated_client_user_1, shared_band, event_factory):
         """Test GET /events/{event_id} as a band member"""
-        # Create band and event
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        event_response = authenticated_client_user_1.post(f"/bands/{band['id']}/events", json=event_data)
-        event = event_response.json()
+        event = await event_factory(shared_band)
         
         # Get event by ID
-        response = authenticated_client_user_1.get(f"/events/{event['id']}")
+        response = await authenticated_client_user_1.get(f"/events/{event['id']}")
         assert response.status_code == 200
         
         data = response.json()
         assert data["id"] == event["id"]
         assert data["title"] == event["title"]
     
-    def test_update_event_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_update_event_as_member(self, authenticated_client_user_1, shared_band, event_factory):
         """Test PUT /events/{event_id} as a band member"""
-        # Create band and event
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        event_response = authenticated_client_user_1.post(f"/bands/{band['id']}/events", json=event_data)
-        event = event_response.json()
+        event = await event_factory(shared_band)
         
         # Update event
         update_data = {"title": "Updated Event Title"}
-        response = authenticated_client_user_1.put(f"/events/{event['id']}", json=update_data)
+        response = await authenticated_client_user_1.put(f"/events/{event['id']}", json=update_data)
         assert response.status_code == 200
         
         data = response.json()
         assert data["title"] == "Updated Event Title"
     
-    def test_delete_event_as_member(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_delete_event_as_member(self, authenticated_client_user_1, shared_band, event_factory, test_session):
         """Test DELETE /events/{event_id} as a band member"""
-        # Create band and event
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        band_response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = band_response.json()
-        
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        event_response = authenticated_client_user_1.post(f"/bands/{band['id']}/events", json=event_data)
-        event = event_response.json()
+        event = await event_factory(shared_band)
         
         # Delete event
-        response = authenticated_client_user_1.delete(f"/events/{event['id']}")
+        response = await authenticated_client_user_1.delete(f"/events/{event['id']}")
         assert response.status_code == 200
-        assert "deleted successfully" in response.json()["message"]
+        assert "deleted successfully" in response.text
         
-        # Verify event is deleted
-        get_response = authenticated_client_user_1.get(f"/events/{event['id']}")
+        # Verify the row is gone
+        assert await test_session.get(Event, UUID(event["id"])) is None
+    
+    @pytest.mark.contract
+    @pytest.mark.asyncio
+    async def test_get_deleted_event_returns_404(self, authenticated_client_user_1, shared_band, event_factory):
+        """Test GET /events/{event_id} returns 404 once the event is deleted"""
+        event = await event_factory(shared_band)
+        
+        response = await authenticated_client_user_1.delete(f"/events/{event['id']}")
+        assert response.status_code == 200
+        
+        get_response = await authenticated_client_user_1.get(f"/events/{event['id']}")
         assert get_response.status_code == 404
 
 
+@pytest.mark.no_db
+class TestUnauthenticatedAccess:
+    """Test that protected endpoints reject requests without authentication"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,path,body", [
+        ("post", "/profiles", PROFILE_PAYLOAD_BYTES),
+        ("get", f"/profiles/{FAKE_ID}", None),
+        ("post", "/bands", BAND_PAYLOAD_BYTES),
+        ("get", f"/bands/{FAKE_ID}", None),
+        ("get", "/my/bands", None),
+        ("post", "/bands/join/fake-code", None),
+    ])
+    async def test_unauthenticated_request_rejected(self, unauthenticated_client, method, path, body):
+        """Test that the endpoint returns 403 without a bearer token"""
+        response = await unauthenticated_client.request(method, path, content=body, headers=JSON_HEADERS)
+        assert response.status_code == 403
+
+
+class TestNonMemberAccess:
+    """Test that band-scoped endpoints reject users outside the band"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,path_tmpl,body", [
+        ("get", "/bands/{band_id}", None),
+        ("get", "/bands/{band_id}/members", None),
+        ("post", "/bands/{band_id}/venues", VENUE_PAYLOAD_BYTES),
+        ("post", "/bands/{band_id}/events", REHEARSAL_EVENT_BYTES),
+    ])
+    async def test_non_member_forbidden(self, authenticated_client_user_2, shared_band, method, path_tmpl, body):
+        """Test that user 2 gets 403 on user 1's band"""
+        path = path_tmpl.format(band_id=shared_band["id"])
+        response = await authenticated_client_user_2.request(method, path, content=body, headers=JSON_HEADERS)
+        assert response.status_code == 403
+
+
+@pytest.mark.smoke
+@pytest.mark.no_db
+@pytest.mark.xdist_group("public")
 class TestPublicEndpoints:
     """Test public endpoints that don't require authentication"""
     
-    def test_root_endpoint(self, unauthenticated_client):
+    @pytest.mark.asyncio
+    async def test_root_handler(self):
+        """Test the / handler returns the running status"""
+        data = await root()
+        assert "message" in data
+        assert data["status"] == "healthy"
+    
+    @pytest.mark.asyncio
+    async def test_health_handler(self):
+        """Test the /health handler reports healthy"""
+        data = await health_check()
+        assert data["status"] == "healthy"
+    
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_root_endpoint(self, unauthenticated_client):
         """Test GET / endpoint"""
-        response = unauthenticated_client.get("/")
+        response = await unauthenticated_client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert "status" in data
     
-    def test_health_endpoint(self, unauthenticated_client):
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_health_endpoint(self, unauthenticated_client):
         """Test GET /health endpoint"""
-        response = unauthenticated_client.get("/health")
+        response = await unauthenticated_client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
\ No newline at end of file
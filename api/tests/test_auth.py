@@ -7,31 +7,20 @@ access control for protected endpoints.
 """
 
 import pytest
-import os
-from fastapi.testclient import TestClient
 from fastapi import HTTPException
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 import jwt
-from datetime import datetime, timezone
-import uuid
 
-# Load environment variables from .env file for testing
-from dotenv import load_dotenv
-load_dotenv()
-
-from auth import SupabaseAuth, get_current_user, get_current_user_optional
-from fastapi.security import HTTPAuthorizationCredentials
-
-# Get the actual JWT secret from environment for testing
-ACTUAL_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
+from auth import SupabaseAuth, TokenVerificationCache, _extract_user_info
 
+@pytest.mark.no_db
 class TestSupabaseAuth:
     """Test the SupabaseAuth class"""
     
-    def test_supabase_auth_initialization(self):
+    def test_supabase_auth_initialization(self, supabase_auth):
         """Test SupabaseAuth initializes correctly with environment variables"""
         # Since we load from .env, test with actual environment
-        auth = SupabaseAuth()
+        auth = supabase_auth
         assert auth.jwt_secret is not None
         assert len(auth.jwt_secret) > 0
     
@@ -42,39 +31,32 @@ class TestSupabaseAuth:
         with pytest.raises(ValueError, match="SUPABASE_URL and SUPABASE_ANON_KEY must be set"):
             SupabaseAuth()
     
-    def test_verify_jwt_token_valid(self):
+    def test_verify_jwt_token_valid(self, supabase_auth, valid_token):
         """Test JWT token verification with valid token"""
-        auth = SupabaseAuth()
-        
-        # Create a valid test token using the actual JWT secret
-        payload = {
-            "sub": "12345678-1234-5678-1234-567812345678",
-            "email": "test@example.com", 
-            "role": "authenticated",
-            "aud": "authenticated",
-            "exp": 9999999999,  # Far future
-            "iat": 1000000000
-        }
-        
-        token = jwt.encode(payload, ACTUAL_JWT_SECRET, algorithm='HS256')
+        auth = supabase_auth
+        token, payload = valid_token
         
         result = auth.verify_jwt_token(token)
         assert result["sub"] == payload["sub"]
         assert result["email"] == payload["email"]
     
-    def test_verify_jwt_token_expired(self):
-        """Test JWT token verification with expired token"""
-        auth = SupabaseAuth()
+    def test_verify_jwt_token_cached(self, valid_token):
+        """Test a repeated token is served from the verification cache when enabled"""
+        with patch('auth.SUPABASE_JWT_CACHE', True):
+            auth = SupabaseAuth()
+        token, _ = valid_token
         
-        # Create an expired token using the actual JWT secret
-        payload = {
-            "sub": "12345678-1234-5678-1234-567812345678",
-            "email": "test@example.com",
-            "exp": 1000000000,  # Past date
-            "aud": "authenticated"
-        }
+        with patch('auth.jwt.decode', wraps=jwt.decode) as decode:
+            first = auth.verify_jwt_token(token)
+            second = auth.verify_jwt_token(token)
         
-        token = jwt.encode(payload, ACTUAL_JWT_SECRET, algorithm='HS256')
+        assert first == second
+        assert decode.call_count == 1
+    
+    def test_verify_jwt_token_expired(self, supabase_auth, expired_token):
+        """Test JWT token verification with expired token"""
+        auth = supabase_auth
+        token, _ = expired_token
         
         with pytest.raises(HTTPException) as exc_info:
             auth.verify_jwt_token(token)
@@ -97,20 +79,10 @@ class TestSupabaseAuth:
             assert exc_info.value.status_code == 401
             assert "Invalid token" in exc_info.value.detail
     
-    def test_get_user_from_token(self):
+    def test_get_user_from_token(self, supabase_auth, valid_token):
         """Test extracting user info from valid token"""
-        auth = SupabaseAuth()
-        
-        payload = {
-            "sub": "12345678-1234-5678-1234-567812345678",
-            "email": "test@example.com",
-            "role": "authenticated",
-            "aud": "authenticated",
-            "exp": 9999999999,
-            "iat": 1000000000
-        }
-        
-        token = jwt.encode(payload, ACTUAL_JWT_SECRET, algorithm='HS256')
+        auth = supabase_auth
+        token, payload = valid_token
         
         user_info = auth.get_user_from_token(token)
         assert user_info["user_id"] == payload["sub"]
@@ -118,10 +90,8 @@ class TestSupabaseAuth:
         assert user_info["role"] == payload["role"]
     
     def test_get_user_from_token_missing_user_id(self):
-        """Test extracting user info from token missing user_id"""
-        auth = SupabaseAuth()
-        
-        payload = {
+        """Test extracting user info from claims missing user_id"""
+        claims = {
             # Missing "sub" field
             "email": "test@example.com",
             "role": "authenticated",
@@ -130,21 +100,94 @@ class TestSupabaseAuth:
             "iat": 1000000000
         }
         
-        token = jwt.encode(payload, ACTUAL_JWT_SECRET, algorithm='HS256')
-        
         with pytest.raises(HTTPException) as exc_info:
-            auth.get_user_from_token(token)
+            _extract_user_info(claims)
         
         assert exc_info.value.status_code == 401
         assert "missing user ID" in exc_info.value.detail
 
+@pytest.mark.no_db
+class TestTokenVerificationCache:
+    """Test expiry, eviction and failure handling of the verified-token cache"""
+    
+    NOW = 1_000_000.0
+    
+    def test_entry_expires_after_ttl(self):
+        """Test an entry is served until its TTL runs out, then dropped"""
+        cache = TokenVerificationCache(ttl=5.0)
+        claims = {"sub": "user-1", "exp": self.NOW + 3600}
+        
+        with patch('auth.time.time', return_value=self.NOW):
+            cache.set("token", claims)
+        with patch('auth.time.time', return_value=self.NOW + 4.9):
+            assert cache.get("token") == claims
+        with patch('auth.time.time', return_value=self.NOW + 5.0):
+            assert cache.get("token") is None
+    
+    def test_entry_never_outlives_token_exp(self):
+        """Test an entry expires at the token's exp claim when that is sooner than the TTL"""
+        cache = TokenVerificationCache(ttl=5.0)
+        claims = {"sub": "user-1", "exp": self.NOW + 2}
+        
+        with patch('auth.time.time', return_value=self.NOW):
+            cache.set("token", claims)
+        with patch('auth.time.time', return_value=self.NOW + 1.9):
+            assert cache.get("token") == claims
+        with patch('auth.time.time', return_value=self.NOW + 2.0):
+            assert cache.get("token") is None
+    
+    def test_expired_claims_not_cached(self):
+        """Test claims whose exp has already passed are never stored"""
+        cache = TokenVerificationCache(ttl=5.0)
+        
+        with patch('auth.time.time', return_value=self.NOW):
+            cache.set("token", {"sub": "user-1", "exp": self.NOW - 1})
+            assert cache.get("token") is None
+    
+    def test_lru_eviction_at_maxsize(self):
+        """Test the least recently used entry is evicted once maxsize is exceeded"""
+        cache = TokenVerificationCache(maxsize=2, ttl=5.0)
+        
+        with patch('auth.time.time', return_value=self.NOW):
+            cache.set("a", {"sub": "a"})
+            cache.set("b", {"sub": "b"})
+            assert cache.get("a") is not None  # "b" is now least recently used
+            cache.set("c", {"sub": "c"})
+            
+            assert cache.get("b") is None
+            assert cache.get("a") == {"sub": "a"}
+            assert cache.get("c") == {"sub": "c"}
+    
+    def _assert_rejected_twice_without_caching(self, token):
+        """Verify a token twice with the cache enabled; both attempts must decode and fail"""
+        with patch('auth.SUPABASE_JWT_CACHE', True):
+            auth = SupabaseAuth()
+        
+        with patch('auth.jwt.decode', wraps=jwt.decode) as decode:
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc_info:
+                    auth.verify_jwt_token(token)
+                assert exc_info.value.status_code == 401
+        
+        assert decode.call_count == 2
+        assert auth.token_cache.get(token) is None
+    
+    def test_expired_token_not_cached(self, expired_token):
+        """Test an expired token is rejected every time, never served from the cache"""
+        token, _ = expired_token
+        self._assert_rejected_twice_without_caching(token)
+    
+    def test_invalid_token_not_cached(self):
+        """Test an invalid token is rejected every time, never served from the cache"""
+        self._assert_rejected_twice_without_caching("invalid-token")
 
 class TestAuthenticationEndpoints:
     """Test authentication-related API endpoints"""
     
-    def test_get_current_user_profile_authenticated(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_get_current_user_profile_authenticated(self, authenticated_client_user_1, mock_user_1):
         """Test GET /auth/me with authenticated user"""
-        response = authenticated_client_user_1.get("/auth/me")
+        response = await authenticated_client_user_1.get("/auth/me")
         
         assert response.status_code == 200
         data = response.json()
@@ -152,171 +195,132 @@ class TestAuthenticationEndpoints:
         assert "user_id" in data
         assert "display_name" in data
     
-    def test_get_current_user_profile_unauthenticated(self, unauthenticated_client):
+    @pytest.mark.asyncio
+    async def test_get_current_user_profile_unauthenticated(self, unauthenticated_client):
         """Test GET /auth/me without authentication"""
-        response = unauthenticated_client.get("/auth/me")
+        response = await unauthenticated_client.get("/auth/me")
         assert response.status_code == 403
     
-    def test_update_current_user_profile(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_update_current_user_profile(self, authenticated_client_user_1, user1_profile):
         """Test PUT /auth/me to update profile"""
-        # First create a profile
-        profile_data = {
-            "display_name": "Original Name",
-            "email": mock_user_1["email"]
-        }
-        create_response = authenticated_client_user_1.post("/profiles", json=profile_data)
-        assert create_response.status_code == 201
-        
-        # Then update it
         update_data = {"display_name": "Updated Name"}
-        response = authenticated_client_user_1.put("/auth/me", json=update_data)
+        response = await authenticated_client_user_1.put("/auth/me", json=update_data)
         
         assert response.status_code == 200
         data = response.json()
         assert data["display_name"] == "Updated Name"
     
-    def test_update_current_user_profile_unauthenticated(self, unauthenticated_client):
+    @pytest.mark.asyncio
+    async def test_update_current_user_profile_unauthenticated(self, unauthenticated_client):
         """Test PUT /auth/me without authentication"""
         update_data = {"display_name": "Updated Name"}
         
-        response = unauthenticated_client.put("/auth/me", json=update_data)
+        response = await unauthenticated_client.put("/auth/me", json=update_data)
         assert response.status_code == 403
 
 
 class TestAccessControl:
     """Test access control for protected endpoints"""
     
-    def test_protected_endpoint_without_auth(self, unauthenticated_client):
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,endpoint", [
+        ("GET", "/my/bands"),
+        ("POST", "/bands"),
+        ("POST", "/profiles"),
+    ])
+    async def test_protected_endpoint_without_auth(self, unauthenticated_client, method, endpoint):
         """Test that protected endpoints reject unauthenticated requests"""
+        send = getattr(unauthenticated_client, method.lower())
+        response = await send(endpoint, **({"json": {}} if method == "POST" else {}))
         
-        # Test various protected endpoints
-        protected_endpoints = [
-            ("GET", "/my/bands"),
-            ("POST", "/bands"),
-            ("POST", "/profiles"),
-        ]
-        
-        for method, endpoint in protected_endpoints:
-            if method == "GET":
-                response = unauthenticated_client.get(endpoint)
-            elif method == "POST":
-                response = unauthenticated_client.post(endpoint, json={})
-            
-            assert response.status_code == 403, f"Endpoint {method} {endpoint} should require authentication"
+        assert response.status_code == 403, f"Endpoint {method} {endpoint} should require authentication"
     
-    def test_band_member_access_control(self, authenticated_client_user_1, authenticated_client_user_2):
+    @pytest.mark.asyncio
+    async def test_band_member_access_control(self, authenticated_client_user_1, authenticated_client_user_2):
         """Test that users can only access bands they're members of"""
         
         # User 1 creates a band
         band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        response = authenticated_client_user_1.post("/bands", json=band_data)
+        response = await authenticated_client_user_1.post("/bands", json=band_data)
         assert response.status_code == 201
         band = response.json()
         band_id = band["id"]
         
         # User 1 can access the band
-        response = authenticated_client_user_1.get(f"/bands/{band_id}")
+        response = await authenticated_client_user_1.get(f"/bands/{band_id}")
         assert response.status_code == 200
         
         # User 2 cannot access the band (not a member)
-        response = authenticated_client_user_2.get(f"/bands/{band_id}")
+        response = await authenticated_client_user_2.get(f"/bands/{band_id}")
         assert response.status_code == 403
     
-    def test_venue_access_control(self, authenticated_client_user_1, authenticated_client_user_2):
+    @pytest.mark.asyncio
+    async def test_venue_access_control(self, authenticated_client_user_1, authenticated_client_user_2, user1_band_venue):
         """Test that users can only access venues in bands they're members of"""
-        
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = response.json()
-        band_id = band["id"]
-        
-        # User 1 creates a venue
-        venue_data = {"name": "Test Venue", "address": "123 Test St"}
-        response = authenticated_client_user_1.post(f"/bands/{band_id}/venues", json=venue_data)
-        assert response.status_code == 201
-        venue = response.json()
-        venue_id = venue["id"]
+        venue_id = user1_band_venue["id"]
         
         # User 1 can access the venue
-        response = authenticated_client_user_1.get(f"/venues/{venue_id}")
+        response = await authenticated_client_user_1.get(f"/venues/{venue_id}")
         assert response.status_code == 200
         
         # User 2 cannot access the venue
-        response = authenticated_client_user_2.get(f"/venues/{venue_id}")
+        response = await authenticated_client_user_2.get(f"/venues/{venue_id}")
         assert response.status_code == 403
     
-    def test_event_access_control(self, authenticated_client_user_1, authenticated_client_user_2):
+    @pytest.mark.asyncio
+    async def test_event_access_control(self, authenticated_client_user_1, authenticated_client_user_2, user1_band_event):
         """Test that users can only access events in bands they're members of"""
-        from datetime import datetime, timezone
-        
-        # User 1 creates a band
-        band_data = {"name": "Test Band", "timezone": "America/New_York"}
-        response = authenticated_client_user_1.post("/bands", json=band_data)
-        band = response.json()
-        band_id = band["id"]
-        
-        # User 1 creates an event
-        event_data = {
-            "title": "Test Event",
-            "type": "REHEARSAL",
-            "starts_at_utc": "2025-10-15T19:00:00Z",
-            "ends_at_utc": "2025-10-15T21:00:00Z"
-        }
-        response = authenticated_client_user_1.post(f"/bands/{band_id}/events", json=event_data)
-        assert response.status_code == 201
-        event = response.json()
-        event_id = event["id"]
+        event_id = user1_band_event["id"]
         
         # User 1 can access the event
-        response = authenticated_client_user_1.get(f"/events/{event_id}")
+        response = await authenticated_client_user_1.get(f"/events/{event_id}")
         assert response.status_code == 200
         
         # User 2 cannot access the event
-        response = authenticated_client_user_2.get(f"/events/{event_id}")
+        response = await authenticated_client_user_2.get(f"/events/{event_id}")
         assert response.status_code == 403
 
 
 class TestProfileCreationWithAuth:
     """Test profile creation with authentication"""
     
-    def test_create_profile_with_matching_email(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_create_profile_with_matching_email(self, authenticated_client_user_1, mock_user_1):
         """Test creating profile with email matching authenticated user"""
         profile_data = {
             "display_name": "Test User",
             "email": mock_user_1["email"]  # Must match authenticated user's email
         }
         
-        response = authenticated_client_user_1.post("/profiles", json=profile_data)
+        response = await authenticated_client_user_1.post("/profiles", json=profile_data)
         assert response.status_code == 201
         
         data = response.json()
         assert data["email"] == mock_user_1["email"]
         assert data["display_name"] == profile_data["display_name"]
     
-    def test_create_profile_with_mismatched_email(self, authenticated_client_user_1):
+    @pytest.mark.asyncio
+    async def test_create_profile_with_mismatched_email(self, authenticated_client_user_1):
         """Test creating profile with email not matching authenticated user"""
         profile_data = {
             "display_name": "Test User",
             "email": "different@example.com"  # Different from authenticated user's email
         }
         
-        response = authenticated_client_user_1.post("/profiles", json=profile_data)
+        response = await authenticated_client_user_1.post("/profiles", json=profile_data)
         assert response.status_code == 400
-        assert "must match authenticated user's email" in response.json()["detail"]
+        assert "must match authenticated user's email" in response.text
     
-    def test_create_duplicate_profile(self, authenticated_client_user_1, mock_user_1):
+    @pytest.mark.asyncio
+    async def test_create_duplicate_profile(self, authenticated_client_user_1, mock_user_1, user1_profile):
         """Test creating duplicate profile for same user"""
         profile_data = {
             "display_name": "Test User",
             "email": mock_user_1["email"]
         }
         
-        # Create first profile
-        response1 = authenticated_client_user_1.post("/profiles", json=profile_data)
-        assert response1.status_code == 201
-        
-        # Try to create second profile for same user
-        response2 = authenticated_client_user_1.post("/profiles", json=profile_data)
-        assert response2.status_code == 400
-        assert "already exists" in response2.json()["detail"]
\ No newline at end of file
+        # Try to create a second profile for the same user
+        response = await authenticated_client_user_1.post("/profiles", json=profile_data)
+        assert response.status_code == 400
+        assert "already exists" in response.text
\ No newline at end of file
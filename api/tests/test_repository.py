@@ -6,25 +6,37 @@ in isolation, using an in-memory SQLite database.
 """
 
 import pytest
-from uuid import uuid4
-from datetime import datetime, timezone
+from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from repository import BandRepository
-from schemas import ProfileCreate, BandCreate, VenueCreate, EventCreate, EventUpdate
+from schemas import EventUpdate
 from models import BandRole, EventType, EventStatus
 from tests.factories import (
-    ProfileFactory, BandFactory, VenueFactory, EventFactory, MembershipFactory,
+    ProfileFactory, BandFactory, VenueFactory, EventFactory, ProfileModelFactory,
     TEST_USER_ID_1, TEST_USER_ID_2
 )
 
+# Fixed users for the membership and role tests
+BAND_TEST_ADMIN = UUID("12345678-1234-5678-1234-567812345678")
+BAND_TEST_MEMBER = UUID("87654321-4321-8765-4321-876543218765")
+NON_MEMBER_ID = UUID("11111111-1111-1111-1111-111111111111")
+
+def _profile_tuple(profile):
+    """Identifying columns of a profile, for comparing two loads in one assertion"""
+    return (profile.user_id, profile.display_name, profile.email)
+
+def _band_tuple(band):
+    """Identifying columns of a band, for comparing two loads in one assertion"""
+    return (band.id, band.name, band.timezone, band.created_by)
+
 class TestProfileRepository:
     """Test profile-related repository operations"""
     
     @pytest.mark.asyncio
     async def test_create_profile(self, test_repo: BandRepository):
         """Test creating a new profile"""
-        profile_data = ProfileFactory()
+        profile_data = ProfileFactory.build_fast()
         user_id = TEST_USER_ID_1
         
         profile = await test_repo.create_profile(profile_data, user_id)
@@ -35,29 +47,25 @@ class TestProfileRepository:
         assert profile.created_at is not None
     
     @pytest.mark.asyncio
-    async def test_get_profile(self, test_repo: BandRepository):
+    async def test_get_profile(self, test_repo: BandRepository, sample_profile_data):
         """Test retrieving a profile by ID"""
         # Create a profile first
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        created_profile = await test_repo.create_profile(profile_data, user_id)
+        created_profile = await test_repo.create_profile(sample_profile_data, user_id)
         
         # Retrieve the profile
         retrieved_profile = await test_repo.get_profile(user_id)
         
         assert retrieved_profile is not None
-        assert retrieved_profile.user_id == created_profile.user_id
-        assert retrieved_profile.display_name == created_profile.display_name
-        assert retrieved_profile.email == created_profile.email
+        assert _profile_tuple(retrieved_profile) == _profile_tuple(created_profile)
     
     @pytest.mark.asyncio
-    async def test_get_profile_by_email(self, test_repo: BandRepository):
+    async def test_get_profile_by_email(self, test_repo: BandRepository, sample_profile_data):
         """Test retrieving a profile by email"""
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        created_profile = await test_repo.create_profile(profile_data, user_id)
+        created_profile = await test_repo.create_profile(sample_profile_data, user_id)
         
-        retrieved_profile = await test_repo.get_profile_by_email(profile_data.email)
+        retrieved_profile = await test_repo.get_profile_by_email(sample_profile_data.email)
         
         assert retrieved_profile is not None
         assert retrieved_profile.email == created_profile.email
@@ -102,15 +110,14 @@ class TestProfileRepository:
         assert profile.display_name == display_name
     
     @pytest.mark.asyncio
-    async def test_ensure_profile_exists_existing_user(self, test_repo: BandRepository):
+    async def test_ensure_profile_exists_existing_user(self, test_repo: BandRepository, sample_profile_data):
         """Test ensure_profile_exists returns existing profile"""
         # Create a profile first
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        created_profile = await test_repo.create_profile(profile_data, user_id)
+        created_profile = await test_repo.create_profile(sample_profile_data, user_id)
         
         # Call ensure_profile_exists - should return existing profile
-        profile = await test_repo.ensure_profile_exists(user_id, profile_data.email, "Different Name")
+        profile = await test_repo.ensure_profile_exists(user_id, sample_profile_data.email, "Different Name")
         
         assert profile.user_id == created_profile.user_id
         assert profile.email == created_profile.email
@@ -127,20 +134,31 @@ class TestProfileRepository:
         assert profile.user_id == user_id
         assert profile.email == email
         assert profile.display_name == "testuser"  # Should be email prefix
+    
+    @pytest.mark.asyncio
+    async def test_bulk_setup_rolls_back_on_error(self, test_repo: BandRepository):
+        """Test an exception inside bulk_setup discards everything created in the block"""
+        with pytest.raises(RuntimeError):
+            async with test_repo.bulk_setup():
+                await test_repo.create_profile(ProfileFactory(), TEST_USER_ID_1)
+                raise RuntimeError("setup failed")
+        
+        assert await test_repo.get_profile(TEST_USER_ID_1) is None
 
 class TestBandRepository:
     """Test band-related repository operations"""
     
     @pytest.mark.asyncio
-    async def test_create_band(self, test_repo: BandRepository):
+    async def test_create_band(self, test_repo: BandRepository, model_factories):
         """Test creating a new band"""
-        # Create a user first
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
+        
+        # Insert the creator's profile directly; bands.created_by references it
+        ProfileModelFactory(user_id=user_id)
+        await test_repo.db.flush()
         
         # Create a band
-        band_data = BandFactory()
+        band_data = BandFactory.build_fast()
         band = await test_repo.create_band(band_data, user_id)
         
         assert band.name == band_data.name
@@ -153,50 +171,39 @@ class TestBandRepository:
     @pytest.mark.asyncio
     async def test_create_band_creates_leader_membership(self, test_repo: BandRepository):
         """Test that creating a band automatically creates a leader membership"""
-        # Create a user first
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        # Create a band
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
         
-        # Check that the user is a leader of the band
-        is_leader = await test_repo.check_user_is_band_leader(user_id, band.id)
-        assert is_leader is True
+        # Create a user and their band in one transaction
+        async with test_repo.bulk_setup():
+            await test_repo.create_profile(ProfileFactory(), user_id)
+            band = await test_repo.create_band(BandFactory(), user_id, with_members=True)
         
-        # Check band members
-        members = await test_repo.get_band_members(band.id)
+        # The creator is the band's only member, as its leader
+        members = band.memberships
         assert len(members) == 1
         assert members[0].user_id == user_id
         assert members[0].role == BandRole.LEADER
+        assert members[0].user.user_id == user_id
     
     @pytest.mark.asyncio
-    async def test_get_band(self, test_repo: BandRepository):
+    async def test_get_band(self, test_repo: BandRepository, seeded_band):
         """Test retrieving a band by ID"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        created_band = await test_repo.create_band(band_data, user_id)
+        created_band = seeded_band.band
         
         # Retrieve the band
         retrieved_band = await test_repo.get_band(created_band.id)
         
         assert retrieved_band is not None
-        assert retrieved_band.id == created_band.id
-        assert retrieved_band.name == created_band.name
+        assert _band_tuple(retrieved_band) == _band_tuple(created_band)
     
     @pytest.mark.asyncio
-    async def test_get_user_bands(self, test_repo: BandRepository):
+    async def test_get_user_bands(self, test_repo: BandRepository, model_factories):
         """Test retrieving all bands for a user"""
-        # Create user
-        profile_data = ProfileFactory()
         user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
+        
+        # Insert the creator's profile directly; bands.created_by references it
+        ProfileModelFactory(user_id=user_id)
+        await test_repo.db.flush()
         
         # Create multiple bands
         band1_data = BandFactory(name="Band 1")
@@ -209,9 +216,14 @@ class TestBandRepository:
         user_bands = await test_repo.get_user_bands(user_id)
         
         assert len(user_bands) == 2
-        band_names = [band.name for band in user_bands]
-        assert "Band 1" in band_names
-        assert "Band 2" in band_names
+        assert {band.name for band in user_bands} == {"Band 1", "Band 2"}
+        
+        # Fetch both bands and their memberships in one round
+        bands = await test_repo.get_bands_with_members([band1.id, band2.id])
+        
+        assert set(bands) == {band1.id, band2.id}
+        for band in bands.values():
+            assert [member.user_id for member in band.memberships] == [user_id]
     
     @pytest.mark.asyncio
     async def test_join_band(self, test_repo: BandRepository):
@@ -222,48 +234,52 @@ class TestBandRepository:
         user1_id = TEST_USER_ID_1
         user2_id = TEST_USER_ID_2
         
-        await test_repo.create_profile(profile1_data, user1_id)
-        await test_repo.create_profile(profile2_data, user2_id)
-        
-        # User 1 creates a band
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user1_id)
+        # User 1 creates a band; the setup is committed once
+        async with test_repo.bulk_setup():
+            await test_repo.bulk_create_profiles([(profile1_data, user1_id), (profile2_data, user2_id)])
+            band = await test_repo.create_band(BandFactory(), user1_id)
         
         # User 2 joins the band
-        membership = await test_repo.join_band(band.join_code, user2_id)
+        membership = await test_repo.join_band(band.join_code, user2_id, with_members=True)
         
         assert membership is not None
         assert membership.band_id == band.id
         assert membership.user_id == user2_id
         assert membership.role == BandRole.MEMBER
         
-        # Verify user is now in the band
-        is_member = await test_repo.check_user_in_band(user2_id, band.id)
-        assert is_member is True
-        
-        # Check total band members
-        members = await test_repo.get_band_members(band.id)
+        # Verify user is now in the band, alongside the leader
+        members = membership.band.memberships
         assert len(members) == 2
+        assert user2_id in [member.user_id for member in members]
 
     @pytest.mark.asyncio
-    async def test_is_band_member(self, test_session: AsyncSession):
+    async def test_join_band_after_join_code_change(self, test_repo: BandRepository):
+        """Test the old join code stops working once the band's join code is updated"""
+        profile1_data = ProfileFactory()
+        profile2_data = ProfileFactory()
+        await test_repo.bulk_create_profiles([(profile1_data, TEST_USER_ID_1), (profile2_data, TEST_USER_ID_2)])
+        
+        band = await test_repo.create_band(BandFactory(), TEST_USER_ID_1)
+        old_code = band.join_code
+        await test_repo.update_band(band.id, {"join_code": "newcode123"})
+        
+        assert await test_repo.join_band(old_code, TEST_USER_ID_2) is None
+        membership = await test_repo.join_band("newcode123", TEST_USER_ID_2)
+        assert membership is not None
+        assert membership.band_id == band.id
+    
+    @pytest.mark.asyncio
+    async def test_is_band_member(self, test_repo: BandRepository, seeded_band):
         """Test checking if user is a band member"""
-        test_repo = BandRepository(test_session)
-        
-        # Create test band and user using repository methods
-        user_id = "12345678-1234-5678-1234-567812345678"  # Valid UUID
-        profile_data = ProfileFactory(user_id=user_id)
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
         
         # User should already be a member (band creator becomes leader)
         is_member = await test_repo.is_band_member(band.id, user_id)
         assert is_member is True
         
         # Test with non-existent user
-        is_member = await test_repo.is_band_member(band.id, "87654321-4321-8765-4321-876543218765")
+        is_member = await test_repo.is_band_member(band.id, BAND_TEST_MEMBER)
         assert is_member is False
 
     @pytest.mark.asyncio
@@ -272,19 +288,21 @@ class TestBandRepository:
         test_repo = BandRepository(test_session)
         
         # Create test band and users using repository methods
-        admin_user_id = "12345678-1234-5678-1234-567812345678"  # Valid UUID
-        member_user_id = "87654321-4321-8765-4321-876543218765"  # Valid UUID
+        admin_user_id = BAND_TEST_ADMIN
+        member_user_id = BAND_TEST_MEMBER
         
-        # Create admin user and band (admin becomes leader)
+        # Create both users, then the band (admin becomes leader)
         admin_profile_data = ProfileFactory(user_id=admin_user_id)
-        await test_repo.create_profile(admin_profile_data, admin_user_id)
+        member_profile_data = ProfileFactory(user_id=member_user_id)
+        await test_repo.bulk_create_profiles([
+            (admin_profile_data, admin_user_id),
+            (member_profile_data, member_user_id)
+        ])
         
         band_data = BandFactory()
         band = await test_repo.create_band(band_data, admin_user_id)
         
-        # Create member user and add them to the band
-        member_profile_data = ProfileFactory(user_id=member_user_id)
-        await test_repo.create_profile(member_profile_data, member_user_id)
+        # Add the member user to the band
         await test_repo.join_band(band.join_code, member_user_id)
         
         # Check admin role (should be LEADER, not ADMIN)
@@ -296,43 +314,29 @@ class TestBandRepository:
         assert role == BandRole.MEMBER
         
         # Check non-member user (should return None)
-        non_member_id = "11111111-1111-1111-1111-111111111111"  # Valid UUID
-        role = await test_repo.get_user_band_role(band.id, non_member_id)
+        role = await test_repo.get_user_band_role(band.id, NON_MEMBER_ID)
         assert role is None
 
 class TestVenueRepository:
     """Test venue-related repository operations"""
     
     @pytest.mark.asyncio
-    async def test_create_venue(self, test_repo: BandRepository):
+    async def test_create_venue(self, test_repo: BandRepository, seeded_band, sample_venue_data):
         """Test creating a new venue"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
         
         # Create venue
-        venue_data = VenueFactory()
-        venue = await test_repo.create_venue(venue_data, band.id)
+        venue = await test_repo.create_venue(sample_venue_data, band.id)
         
-        assert venue.name == venue_data.name
-        assert venue.address == venue_data.address
-        assert venue.notes == venue_data.notes
+        assert venue.name == sample_venue_data.name
+        assert venue.address == sample_venue_data.address
+        assert venue.notes == sample_venue_data.notes
         assert venue.band_id == band.id
     
     @pytest.mark.asyncio
-    async def test_get_band_venues(self, test_repo: BandRepository):
+    async def test_get_band_venues(self, test_repo: BandRepository, seeded_band):
         """Test retrieving all venues for a band"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
         
         # Create multiple venues
         venue1_data = VenueFactory(name="Venue 1")
@@ -344,27 +348,20 @@ class TestVenueRepository:
         # Get band venues
         venues = await test_repo.get_band_venues(band.id)
         
-        assert len(venues) == 2
-        venue_names = [venue.name for venue in venues]
-        assert "Venue 1" in venue_names
-        assert "Venue 2" in venue_names
+        assert len(venues) == 3  # Two new venues plus the seeded one
+        assert {venue.name for venue in venues} == {"Venue 1", "Venue 2", seeded_band.venue.name}
 
 class TestEventRepository:
     """Test event-related repository operations"""
     
     @pytest.mark.asyncio
-    async def test_create_event(self, test_repo: BandRepository):
+    async def test_create_event(self, test_repo: BandRepository, seeded_band):
         """Test creating a new event"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
         
         # Create event
-        event_data = EventFactory()
+        event_data = EventFactory.build_fast()
         event = await test_repo.create_event(event_data, band.id, user_id)
         
         assert event.title == event_data.title
@@ -374,19 +371,11 @@ class TestEventRepository:
         assert event.status == EventStatus.PLANNED  # Default status
     
     @pytest.mark.asyncio
-    async def test_create_event_with_venue(self, test_repo: BandRepository):
+    async def test_create_event_with_venue(self, test_repo: BandRepository, seeded_band):
         """Test creating an event with a venue"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
-        
-        # Create venue
-        venue_data = VenueFactory()
-        venue = await test_repo.create_venue(venue_data, band.id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
+        venue = seeded_band.venue
         
         # Create event with venue
         event_data = EventFactory(venue_id=venue.id)
@@ -395,45 +384,34 @@ class TestEventRepository:
         assert event.venue_id == venue.id
     
     @pytest.mark.asyncio
-    async def test_get_band_events(self, test_repo: BandRepository):
+    async def test_get_band_events(self, test_repo: BandRepository, seeded_band):
         """Test retrieving all events for a band"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
         
         # Create multiple events
         event1_data = EventFactory(title="Rehearsal 1")
         event2_data = EventFactory(title="Gig 1", type=EventType.GIG)
         
-        await test_repo.create_event(event1_data, band.id, user_id)
-        await test_repo.create_event(event2_data, band.id, user_id)
+        # Create both events in one transaction
+        async with test_repo.bulk_setup():
+            await test_repo.create_event(event1_data, band.id, user_id)
+            await test_repo.create_event(event2_data, band.id, user_id)
         
         # Get band events
         events = await test_repo.get_band_events(band.id)
         
         assert len(events) == 2
-        event_titles = [event.title for event in events]
-        assert "Rehearsal 1" in event_titles
-        assert "Gig 1" in event_titles
+        assert {event.title for event in events} == {"Rehearsal 1", "Gig 1"}
     
     @pytest.mark.asyncio
-    async def test_update_event(self, test_repo: BandRepository):
+    async def test_update_event(self, test_repo: BandRepository, seeded_band, sample_event_data):
         """Test updating an event"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
         
         # Create event
-        event_data = EventFactory()
-        event = await test_repo.create_event(event_data, band.id, user_id)
+        event = await test_repo.create_event(sample_event_data, band.id, user_id)
         
         # Update event
         update_data = EventUpdate(
@@ -446,22 +424,16 @@ class TestEventRepository:
         assert updated_event.title == "Updated Event Title"
         assert updated_event.status == EventStatus.CONFIRMED
         # Original fields should remain unchanged
-        assert updated_event.type == event_data.type
+        assert updated_event.type == sample_event_data.type
     
     @pytest.mark.asyncio
-    async def test_delete_event(self, test_repo: BandRepository):
+    async def test_delete_event(self, test_repo: BandRepository, seeded_band, sample_event_data):
         """Test deleting an event"""
-        # Create user and band
-        profile_data = ProfileFactory()
-        user_id = TEST_USER_ID_1
-        await test_repo.create_profile(profile_data, user_id)
-        
-        band_data = BandFactory()
-        band = await test_repo.create_band(band_data, user_id)
+        band = seeded_band.band
+        user_id = seeded_band.user_id
         
         # Create event
-        event_data = EventFactory()
-        event = await test_repo.create_event(event_data, band.id, user_id)
+        event = await test_repo.create_event(sample_event_data, band.id, user_id)
         
         # Delete event
         success = await test_repo.delete_event(event.id)